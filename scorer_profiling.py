@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+scorer_profiling.py
+
+Toggleable instrumentation for the sentiment scorer scripts.
+
+Each scorer gets its own ScorerProfiler. Inside a profiling session it can:
+  - time named stages (tokenize, forward, read_csv, ...) and keep every
+    call's latency, so per-chunk latency histograms come for free
+  - count work items (tokens, chunks, transcripts) for throughput figures
+  - record peak resident memory of the whole process
+  - optionally run cProfile and/or torch.profiler and export their traces
+and writes everything to one JSON report per run.
+
+A profiler created with parent=True (the pipeline's) groups a run: scorer
+sessions started while its session is open take the parent's run_id as a
+prefix and record it as parent_run_id, and the parent report lists their
+run_ids under child_run_ids, so one pipeline run's files sort together.
+
+cProfile is started by the scorer sessions, never by the pipeline session
+(see sentiment_pipeline.py). How much it sees depends on the Python version:
+up to 3.11 it records only the thread that started it, so each scorer's
+.prof covers just that scorer; from 3.12 on it is process-wide and only one
+may be active, so when scorers run concurrently the first one to start
+profiles all threads and the others record a note instead.
+
+torch.profiler is opt-in per instance (torch_trace=True) and only the
+transformer scorer enables it; the other scorers run no torch ops, and
+concurrent torch.profiler sessions are not supported.
+
+Profiling is off unless SCORER_PROFILE=1 is set in the environment. When off,
+stage() hands back a shared no-op context manager and count() returns
+immediately, so the instrumented code paths cost next to nothing.
+
+Environment toggles:
+  SCORER_PROFILE=1          enable timers, counters and the JSON report
+  SCORER_PROFILE_CPROFILE=1 also run cProfile and dump a .prof file
+  SCORER_PROFILE_TORCH=1    also run torch.profiler (transformer scorer only)
+  SCORER_PROFILE_DIR=path   where reports go (default: profiles/)
+"""
+
+import contextlib
+import cProfile
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# ─── CONFIG ───────────────────────────────────────────────────────────────────
+PROFILE_ENABLED  = os.environ.get("SCORER_PROFILE") == "1"
+PROFILE_CPROFILE = os.environ.get("SCORER_PROFILE_CPROFILE") == "1"
+PROFILE_TORCH    = os.environ.get("SCORER_PROFILE_TORCH") == "1"
+PROFILE_DIR      = os.environ.get("SCORER_PROFILE_DIR", "profiles")
+
+# Latency histogram bucket edges, in milliseconds; buckets are half-open
+# [lo, hi), so each is reported by its exclusive upper bound ("lt")
+HISTOGRAM_EDGES_MS = [0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf")]
+
+_NULL_STAGE = contextlib.nullcontext()
+
+# Open parent session, if any: {"run_id": ..., "children": [...]}
+_parent_run = None
+_parent_lock = threading.Lock()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB everywhere else
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def summarize_latencies(seconds: list[float]) -> dict:
+    """Count/total/mean/percentiles and a bucketed histogram, all in ms."""
+    ms = np.asarray(seconds) * 1000
+    counts, _ = np.histogram(ms, bins=HISTOGRAM_EDGES_MS)
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {
+        "count":    len(ms),
+        "total_ms": float(ms.sum()),
+        "mean_ms":  float(ms.mean()),
+        "p50_ms":   float(p50),
+        "p90_ms":   float(p90),
+        "p99_ms":   float(p99),
+        "max_ms":   float(ms.max()),
+        "histogram_ms": [
+            {"lt": edge if edge != float("inf") else "inf", "count": int(n)}
+            for edge, n in zip(HISTOGRAM_EDGES_MS[1:], counts)
+        ],
+    }
+
+
+class ScorerProfiler:
+    """
+    Collects stage timings and counters for one scorer. Use session() around
+    a whole run; sessions nest, and only the outermost one starts the
+    optional profilers and writes the report.
+    """
+
+    def __init__(self, name: str, enabled: bool = PROFILE_ENABLED,
+                 cprofile: bool = PROFILE_CPROFILE, torch_trace: bool = False,
+                 parent: bool = False, output_dir: str = PROFILE_DIR):
+        self.name        = name
+        self.parent      = parent
+        self.enabled     = enabled
+        self.cprofile    = enabled and cprofile
+        self.torch_trace = enabled and torch_trace
+        self.output_dir  = output_dir
+        self._depth      = 0
+        self._lock       = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.timings  = {}
+        self.counters = {}
+        self.notes    = []
+
+    # ─── Instrumentation hooks ───────────────────────────────────────────────
+
+    def stage(self, name: str):
+        """Context manager timing one occurrence of stage `name`."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.timings.setdefault(name, []).append(elapsed)
+
+    def count(self, name: str, n: int = 1):
+        """Add `n` to counter `name` (tokens, chunks, transcripts, ...)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    # ─── Sessions ────────────────────────────────────────────────────────────
+
+    @contextlib.contextmanager
+    def session(self):
+        """Profile everything inside the block and write one JSON report."""
+        if not self.enabled or self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+
+        self._depth = 1
+        self._reset()
+        run_id, parent_run_id = self._open_run()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        cprof = self._start_cprofile()
+        torch_prof = self._start_torch_profiler()
+        started_at = datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            wall = time.perf_counter() - start
+            self._depth = 0
+            children = self._close_run()
+            artifacts = {}
+            if cprof is not None:
+                cprof.disable()
+                artifacts["cprofile"] = os.path.join(self.output_dir, f"{run_id}.prof")
+                cprof.dump_stats(artifacts["cprofile"])
+            if torch_prof is not None:
+                torch_prof.stop()
+                artifacts["torch_trace"] = os.path.join(self.output_dir, f"{run_id}.trace.json")
+                torch_prof.export_chrome_trace(artifacts["torch_trace"])
+            self._write_report(run_id, parent_run_id, children, started_at, wall, artifacts)
+
+    def _open_run(self):
+        """
+        Pick this session's run_id. Under an open parent session it is
+        '<parent run_id>_<name>'; returns (run_id, parent_run_id or None).
+        """
+        global _parent_run
+        with _parent_lock:
+            if self.parent or _parent_run is None:
+                stamp = f"{datetime.datetime.now():%Y%m%d-%H%M%S-%f}_{os.getpid()}"
+                run_id, parent_run_id = f"{self.name}_{stamp}", None
+            else:
+                parent_run_id = _parent_run["run_id"]
+                run_id = f"{parent_run_id}_{self.name}"
+                _parent_run["children"].append(run_id)
+            if self.parent:
+                _parent_run = {"run_id": run_id, "children": []}
+        return run_id, parent_run_id
+
+    def _close_run(self):
+        """End a parent session; returns the run_ids of its child sessions."""
+        global _parent_run
+        if not self.parent:
+            return None
+        with _parent_lock:
+            children, _parent_run = _parent_run["children"], None
+        return children
+
+    def _start_cprofile(self):
+        if not self.cprofile:
+            return None
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError as e:
+            # Only one cProfile may be active at a time (e.g. concurrent scorers)
+            self.notes.append(f"cProfile not started: {e}")
+            return None
+        return prof
+
+    def _start_torch_profiler(self):
+        if not self.torch_trace:
+            return None
+        try:
+            import torch.profiler
+        except ImportError:
+            self.notes.append("torch.profiler not started: torch is not installed")
+            return None
+        prof = torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU])
+        prof.start()
+        return prof
+
+    def _write_report(self, run_id, parent_run_id, children, started_at, wall, artifacts):
+        stages = {name: summarize_latencies(t) for name, t in self.timings.items()}
+        throughput = {
+            f"{name}_per_sec": n / wall if wall > 0 else None
+            for name, n in self.counters.items()
+        }
+        if "tokens" in self.counters and "forward" in self.timings:
+            forward_time = sum(self.timings["forward"])
+            throughput["tokens_per_forward_sec"] = (
+                self.counters["tokens"] / forward_time if forward_time > 0 else None
+            )
+
+        report = {
+            "scorer":       self.name,
+            "run_id":       run_id,
+            "parent_run_id": parent_run_id,
+            "started_at":   started_at,
+            "wall_time_s":  wall,
+            "stages":       stages,
+            "counters":     self.counters,
+            "throughput":   throughput,
+            # ru_maxrss is the peak of the whole process since it started, so
+            # scorers sharing a pipeline run all report the same value
+            "process_peak_rss_mb": peak_rss_mb(),
+            "artifacts":    artifacts,
+            "notes":        self.notes,
+        }
+        if children is not None:
+            report["child_run_ids"] = children
+        path = os.path.join(self.output_dir, f"{run_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"⏱  Profiling report for '{self.name}' written to '{path}'")
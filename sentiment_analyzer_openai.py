@@ -1,10 +1,15 @@
-import os
 import pandas as pd
-from openai import OpenAI
+from openai import APIError, OpenAI
+
+from scorer_profiling import ScorerProfiler
 
 # ─── CONFIGURATION ─────────────────────────────────────────────────────────────
-# Base path where your CSV and output files reside
-BASE_PATH = r"channel_videos"
+# CSV that contains the transcripts (and any other columns you have)
+INPUT_CSV = "channel_videos.csv"
+OUTPUT_EXCEL = "new_data.xlsx"
+MODEL_NAME = "gpt-4.1"
+
+profiler = ScorerProfiler("openai")
 
 # Define the dimensions we want to score and their descriptions
 parameters = {
@@ -26,46 +31,72 @@ Separate each number with a comma. Do not include any explanation or extra text.
 
 """
 
-# ─── LOAD YOUR DATA ────────────────────────────────────────────────────────────
-# Read the CSV that contains the transcripts (and any other columns you have)
-input_csv_path = os.path(BASE_PATH)
-df = pd.read_csv(input_csv_path)
-
-# ─── INITIALIZE OPENAI CLIENT ───────────────────────────────────────────────────
-# Make sure your environment variable OPENAI_API_KEY is set, or pass it explicitly.
-client = OpenAI()
-
-# ─── PREPARE A DATAFRAME TO HOLD THE SCORES ────────────────────────────────────
-# We'll store the four numeric scores for each dimension in this new DataFrame
-new_data = pd.DataFrame(columns=parameters.keys())
-
-# ─── LOOP OVER EACH ROW, QUERY GPT, AND PARSE THE RESPONSE ────────────────────
-for idx, row in df.iterrows():
-    # 1) Extract the transcript and remove any stray double quotes
-    transcript_text = row["transcript"].replace('"', "")
-
-    # 2) Build the full prompt by appending the transcript to our template
-    full_prompt = prompt_template + transcript_text
-
-    # 3) Send the request to the ChatGPT model
-    response = client.responses.create(
-        model="gpt-4.1",
-        input=full_prompt
-    )
-
-    # 4) The model’s raw output: e.g., "2, 7, 5, 8"
-    resp_text = response.output_text.strip()
-    print(f"{idx}:\t{resp_text}")
-
-    # 5) Split the comma-separated numbers and assign to the new_data DataFrame
-    scores = [s.strip() for s in resp_text.split(",")]
-    new_data.loc[idx, parameters.keys()] = scores
-
-# ─── MERGE THE SCORES BACK INTO THE ORIGINAL DATAFRAME ─────────────────────────
-for col in new_data.columns:
-    df[col] = new_data[col]
-
-# ─── SAVE THE SCORES TO EXCEL ──────────────────────────────────────────────────
-output_excel_path = os.path("new_data.xlsx")
-new_data.to_excel(output_excel_path, index=False)
-print(f"Saved scored data to: {output_excel_path}")
\ No newline at end of file
+
+def score_openai(transcripts: pd.Series) -> pd.DataFrame:
+    """
+    Ask the model to score each transcript on every dimension in `parameters`.
+    Returns a DataFrame with one column per dimension, aligned to the input index.
+    """
+    with profiler.session():
+        # Make sure your environment variable OPENAI_API_KEY is set, or pass it explicitly.
+        client = OpenAI()
+
+        # We'll store the four numeric scores for each dimension in this new DataFrame
+        new_data = pd.DataFrame(columns=list(parameters.keys()), index=transcripts.index)
+
+        for idx, transcript in transcripts.items():
+            # 1) Remove any stray double quotes from the transcript
+            transcript_text = str(transcript).replace('"', "")
+
+            # 2) Build the full prompt by appending the transcript to our template
+            full_prompt = prompt_template + transcript_text
+
+            # 3) Send the request to the ChatGPT model; a failed request
+            #    (rate limit, dropped connection, ...) leaves this row NaN
+            try:
+                with profiler.stage("request"):
+                    response = client.responses.create(
+                        model=MODEL_NAME,
+                        input=full_prompt
+                    )
+            except APIError as e:
+                print(f"{idx}:\trequest failed ({e}); leaving NaN")
+                continue
+            profiler.count("transcripts")
+
+            # 4) The model’s raw output: e.g., "2, 7, 5, 8"
+            resp_text = response.output_text.strip()
+            print(f"{idx}:\t{resp_text}")
+
+            # 5) Split the comma-separated numbers and assign to the new_data DataFrame;
+            #    a reply without exactly one value per dimension is left as NaN
+            scores = [s.strip() for s in resp_text.split(",")]
+            if len(scores) != len(parameters):
+                print(f"{idx}:\tmalformed reply, expected {len(parameters)} values; leaving NaN")
+                continue
+            new_data.loc[idx, list(parameters.keys())] = scores
+
+    return new_data.apply(pd.to_numeric, errors="coerce")
+
+
+def main():
+    with profiler.session():
+        # ─── LOAD YOUR DATA ────────────────────────────────────────────────────
+        with profiler.stage("read_csv"):
+            df = pd.read_csv(INPUT_CSV)
+
+        # ─── QUERY GPT FOR EVERY TRANSCRIPT ────────────────────────────────────
+        new_data = score_openai(df["transcript"])
+
+        # ─── MERGE THE SCORES BACK INTO THE ORIGINAL DATAFRAME ─────────────────
+        for col in new_data.columns:
+            df[col] = new_data[col]
+
+        # ─── SAVE THE SCORES TO EXCEL ──────────────────────────────────────────
+        with profiler.stage("write_excel"):
+            new_data.to_excel(OUTPUT_EXCEL, index=False)
+        print(f"Saved scored data to: {OUTPUT_EXCEL}")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,30 +20,36 @@ import torch.nn.functional as F
 
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
+from scorer_profiling import PROFILE_TORCH, ScorerProfiler
+
 # ─── CONFIG ───────────────────────────────────────────────────────────────────
 INPUT_CSV  = "channel_videos.csv"
 OUTPUT_CSV = "youtube_with_transformer_sentiment.csv"
 MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
 
-if not os.path.isfile(INPUT_CSV):
-    raise FileNotFoundError(f"Expected '{INPUT_CSV}' in this folder.")
+device = torch.device("cpu")
+
+profiler = ScorerProfiler("transformer", torch_trace=PROFILE_TORCH)
 
-# 1. Load scraped data
-df = pd.read_csv(INPUT_CSV)
-df = df.dropna(subset=["transcript"]).reset_index(drop=True)
+# Loaded lazily by load_model() so importing this module stays cheap
+tokenizer = None
+model     = None
 
-# 2. Load tokenizer and model
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model     = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
 
-# Put model in eval mode (no dropout) and on CPU
-model.eval()
-device = torch.device("cpu")
-model.to(device)
+def load_model():
+    """
+    Load the tokenizer and model once, put the model in eval mode
+    (no dropout) on CPU, and return (tokenizer, model).
+    """
+    global tokenizer, model
+    if model is None:
+        with profiler.stage("load_model"):
+            tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+            model     = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+            model.eval()
+            model.to(device)
+    return tokenizer, model
 
-# 3. Determine chunk sizes
-max_model_len = tokenizer.model_max_length  # typically 512
-chunk_size     = max_model_len - 2          # reserve 2 IDs for [CLS] & [SEP]
 
 def transcript_to_id_chunks(text: str, chunk_size: int) -> list[list[int]]:
     """
@@ -52,57 +58,102 @@ def transcript_to_id_chunks(text: str, chunk_size: int) -> list[list[int]]:
     Returns a list of lists of token IDs (no special tokens).
     """
     # 1) Encode without special tokens
-    token_ids = tokenizer.encode(text, add_special_tokens=False)
+    with profiler.stage("tokenize"):
+        token_ids = tokenizer.encode(text, add_special_tokens=False)
+    profiler.count("tokens", len(token_ids))
     # 2) Slice into raw ID chunks of size == chunk_size
     chunks = [token_ids[i : i + chunk_size] for i in range(0, len(token_ids), chunk_size)]
     return chunks
 
-# 4. Process each transcript
-all_neg_probs = []
-all_pos_probs = []
-all_scores    = []
 
-for idx, row in df.iterrows():
-    transcript = str(row["transcript"])
-    id_chunks  = transcript_to_id_chunks(transcript, chunk_size)
-    
+def score_transcript(transcript: str, chunk_size: int) -> tuple[float, float]:
+    """
+    Run every chunk of `transcript` through the model and return the
+    chunk-averaged (neg_prob, pos_prob).
+    """
+    id_chunks = transcript_to_id_chunks(transcript, chunk_size)
+
     # For each chunk, build input_ids = [CLS] + chunk_ids + [SEP], then run model
     chunk_neg = []
     chunk_pos = []
-    
+
     for ids in id_chunks:
         # build input IDs with special tokens
-        input_ids = [tokenizer.cls_token_id] + ids + [tokenizer.sep_token_id]
-        input_ids_tensor = torch.tensor([input_ids], device=device)
-        attention_mask   = torch.ones_like(input_ids_tensor)  # all tokens attended
-        
+        with profiler.stage("tensor"):
+            input_ids = [tokenizer.cls_token_id] + ids + [tokenizer.sep_token_id]
+            input_ids_tensor = torch.tensor([input_ids], device=device)
+            attention_mask   = torch.ones_like(input_ids_tensor)  # all tokens attended
+
         # forward pass, get logits (shape: [1, 2])
-        with torch.no_grad():
+        with profiler.stage("forward"), torch.no_grad():
             outputs = model(input_ids=input_ids_tensor, attention_mask=attention_mask)
             logits = outputs.logits  # shape (1, 2)
-        
+
         # convert logits to probabilities
-        probs = F.softmax(logits, dim=-1).squeeze().tolist()
+        with profiler.stage("softmax"):
+            probs = F.softmax(logits, dim=-1).squeeze().tolist()
+        profiler.count("chunks")
         # For distilbert-sst2: label 0 = NEGATIVE, label 1 = POSITIVE
-        neg_prob = probs[0]
-        pos_prob = probs[1]
-        
-        chunk_neg.append(neg_prob)
-        chunk_pos.append(pos_prob)
-    
+        chunk_neg.append(probs[0])
+        chunk_pos.append(probs[1])
+
     # Average across chunks
     avg_neg = sum(chunk_neg) / len(chunk_neg)
     avg_pos = sum(chunk_pos) / len(chunk_pos)
-    score   = avg_pos - avg_neg
-    
-    all_neg_probs.append(avg_neg)
-    all_pos_probs.append(avg_pos)
-    all_scores.append(score)
-
-# 5. Attach to DataFrame and save
-df["transformer_neg_prob"] = all_neg_probs
-df["transformer_pos_prob"] = all_pos_probs
-df["transformer_score"]    = all_scores
-
-df.to_csv(OUTPUT_CSV, index=False)
-print(f"✅ Saved '{OUTPUT_CSV}' with columns: transformer_neg_prob, transformer_pos_prob, transformer_score")
\ No newline at end of file
+    return avg_neg, avg_pos
+
+
+def score_transformer(transcripts: pd.Series) -> pd.DataFrame:
+    """
+    Score each transcript in `transcripts` and return a DataFrame with
+    transformer_neg_prob / transformer_pos_prob / transformer_score,
+    aligned to the input index.
+    """
+    with profiler.session():
+        load_model()
+
+        # Determine chunk sizes
+        max_model_len = tokenizer.model_max_length  # typically 512
+        chunk_size    = max_model_len - 2           # reserve 2 IDs for [CLS] & [SEP]
+
+        all_neg_probs = []
+        all_pos_probs = []
+
+        for transcript in transcripts:
+            with profiler.stage("transcript"):
+                avg_neg, avg_pos = score_transcript(str(transcript), chunk_size)
+            profiler.count("transcripts")
+            all_neg_probs.append(avg_neg)
+            all_pos_probs.append(avg_pos)
+
+    out = pd.DataFrame({
+        "transformer_neg_prob": all_neg_probs,
+        "transformer_pos_prob": all_pos_probs,
+    }, index=transcripts.index)
+    out["transformer_score"] = out["transformer_pos_prob"] - out["transformer_neg_prob"]
+    return out
+
+
+def main():
+    if not os.path.isfile(INPUT_CSV):
+        raise FileNotFoundError(f"Expected '{INPUT_CSV}' in this folder.")
+
+    with profiler.session():
+        # 1. Load scraped data
+        with profiler.stage("read_csv"):
+            df = pd.read_csv(INPUT_CSV)
+        df = df.dropna(subset=["transcript"]).reset_index(drop=True)
+
+        # 2. Score each transcript
+        scores = score_transformer(df["transcript"])
+
+        # 3. Attach to DataFrame and save
+        df = pd.concat([df, scores], axis=1)
+
+        with profiler.stage("write_csv"):
+            df.to_csv(OUTPUT_CSV, index=False)
+    print(f"✅ Saved '{OUTPUT_CSV}' with columns: transformer_neg_prob, transformer_pos_prob, transformer_score")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,21 +10,55 @@ a new CSV with those four extra columns.
 import pandas as pd
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
-# 1. Load your scraped data
-df = pd.read_csv('channel_videos.csv')
+from scorer_profiling import ScorerProfiler
 
-# 2. Drop any rows where transcript is missing
-df = df.dropna(subset=['transcript'])
+# ─── CONFIG ───────────────────────────────────────────────────────────────────
+INPUT_CSV  = 'channel_videos.csv'
+OUTPUT_CSV = 'youtube_with_sentiment.csv'
 
-# 3. Initialize the VADER analyzer once
-analyzer = SentimentIntensityAnalyzer()
+profiler = ScorerProfiler('vader')
 
-# 4. Apply to each transcript, expand into four columns
-scores = df['transcript'].apply(lambda txt: analyzer.polarity_scores(str(txt)))
-sentiment_df = pd.DataFrame(scores.tolist())
 
-# 5. Merge and save
-df = pd.concat([df, sentiment_df], axis=1)
-df.to_csv('youtube_with_sentiment.csv', index=False)
+def score_vader(transcripts: pd.Series) -> pd.DataFrame:
+    """
+    Run VADER over each transcript in `transcripts` and return a DataFrame
+    with columns neg/neu/pos/compound, aligned to the input index.
+    """
+    with profiler.session():
+        # Initialize the VADER analyzer once per call
+        with profiler.stage('load_analyzer'):
+            analyzer = SentimentIntensityAnalyzer()
 
-print("✅ Saved youtube_with_sentiment.csv with columns: ", list(sentiment_df.columns))
\ No newline at end of file
+        scores = []
+        for txt in transcripts:
+            txt = str(txt)
+            with profiler.stage('polarity_scores'):
+                scores.append(analyzer.polarity_scores(txt))
+            profiler.count('transcripts')
+            profiler.count('characters', len(txt))
+
+    return pd.DataFrame(scores, index=transcripts.index)
+
+
+def main():
+    with profiler.session():
+        # 1. Load your scraped data
+        with profiler.stage('read_csv'):
+            df = pd.read_csv(INPUT_CSV)
+
+        # 2. Drop any rows where transcript is missing
+        df = df.dropna(subset=['transcript'])
+
+        # 3. Score each transcript, expand into four columns
+        sentiment_df = score_vader(df['transcript'])
+
+        # 4. Merge and save
+        df = pd.concat([df, sentiment_df], axis=1)
+        with profiler.stage('write_csv'):
+            df.to_csv(OUTPUT_CSV, index=False)
+
+    print(f"✅ Saved {OUTPUT_CSV} with columns: ", list(sentiment_df.columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+sentiment_pipeline.py
+
+Builds processed_data.csv in a single pass:
+
+1. Reads the scraped transcript CSV once.
+2. Fans the transcripts out to every enabled scorer (VADER, transformer,
+   OpenAI) concurrently, one worker thread per scorer.
+3. Computes log_views / log_likes / log_comments in one vectorized step.
+4. Joins everything on video_id and writes one merged CSV. If any scorer
+   fails, the other scorers' results go to PARTIAL_CSV instead, the existing
+   OUTPUT_CSV is left untouched and the script exits non-zero.
+
+Wall time is roughly that of the slowest scorer instead of the sum of all
+three, and the transcript CSV is no longer re-read and re-written per scorer.
+
+With SCORER_PROFILE=1 the pipeline and every scorer each write a JSON
+profiling report, all sharing the pipeline's run_id; see scorer_profiling.py.
+"""
+
+import datetime
+import importlib
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scorer_profiling import ScorerProfiler
+
+# ─── CONFIG ───────────────────────────────────────────────────────────────────
+INPUT_CSV  = "channel_videos.csv"
+OUTPUT_CSV = "processed_data.csv"
+# Written instead of OUTPUT_CSV when any scorer fails, so a failed run never
+# overwrites previously saved (and possibly paid-for) scores
+PARTIAL_CSV = "processed_data.partial.csv"
+
+# name -> (module, scoring function, {scorer column: output column})
+# Only the columns listed in the mapping are kept in the merged table.
+SCORERS = {
+    "vader": (
+        "sentiment_analyzer_vader", "score_vader",
+        {"neg": "neg", "pos": "pos", "neu": "neu"},
+    ),
+    "transformer": (
+        "sentiment_analyzer_transformer", "score_transformer",
+        {"transformer_neg_prob": "transformer_neg_prob"},
+    ),
+    "openai": (
+        "sentiment_analyzer_openai", "score_openai",
+        {
+            "Negativity":                     "Negativity",
+            "Controversiality":               "Controversiality",
+            "Emotional Elevation/Excitement": "EmotionalElevationExcitement",
+            "Overall Quality":                "OverallQuality",
+        },
+    ),
+}
+
+# Scorers to run; drop any you don't have the dependencies / API key for
+ENABLED_SCORERS = ["vader", "transformer", "openai"]
+
+METADATA_COLUMNS = ["video_id", "title", "views", "likes", "comments"]
+LOG_COLUMNS      = ["views", "likes", "comments"]
+
+# Parent of the scorer sessions; cProfile is left to them, see scorer_profiling.py
+profiler = ScorerProfiler("pipeline", cprofile=False, parent=True)
+
+
+# ─── UTILITIES ─────────────────────────────────────────────────────────────────
+
+def timestamp():
+    return datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+def load_transcripts(path: str) -> pd.DataFrame:
+    """
+    Read the scraped CSV once, keep video_id as a string (so IDs such as
+    "-abc123" survive untouched), drop rows without a transcript and
+    de-duplicate on video_id.
+    """
+    df = pd.read_csv(path, dtype={"video_id": str, "published_at": str})
+    df = df.dropna(subset=["video_id", "transcript"])
+    df = df.drop_duplicates(subset="video_id").reset_index(drop=True)
+    return df
+
+
+def add_log_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add log_<col> for every column in LOG_COLUMNS in one vectorized call.
+    Zero counts have no logarithm and are left as NaN.
+    """
+    counts = df[LOG_COLUMNS].apply(pd.to_numeric, errors="coerce").astype(float)
+    logs = np.log(counts.where(counts > 0))
+    logs.columns = [f"log_{col}" for col in LOG_COLUMNS]
+    return pd.concat([df, logs], axis=1)
+
+
+def run_scorer(name: str, transcripts: pd.Series) -> pd.DataFrame:
+    """
+    Import the scorer's module, run it over `transcripts` and return only
+    the configured columns, renamed for the merged table.
+    """
+    module_name, func_name, columns = SCORERS[name]
+    score = getattr(importlib.import_module(module_name), func_name)
+
+    print(f"[{timestamp()}] START scorer '{name}' on {len(transcripts)} transcripts")
+    scores = score(transcripts)
+    print(f"[{timestamp()}] DONE scorer '{name}'")
+
+    return scores[list(columns)].rename(columns=columns)
+
+
+def collect_result(name: str, future, index: pd.Index) -> tuple[pd.DataFrame, bool]:
+    """
+    Return (the finished scorer's columns, whether it succeeded). If the
+    scorer raised, log the error and return its columns empty (NaN) so the
+    other scorers' work can still be saved.
+    """
+    try:
+        return future.result(), True
+    except Exception as e:
+        print(f"[{timestamp()}] ERROR scorer '{name}' failed ({e!r}); "
+              f"leaving its columns empty")
+        columns = list(SCORERS[name][2].values())
+        return pd.DataFrame(np.nan, index=index, columns=columns), False
+
+
+# ─── MAIN PIPELINE ────────────────────────────────────────────────────────────
+
+def main():
+    with profiler.session():
+        with profiler.stage("read_csv"):
+            df = load_transcripts(INPUT_CSV)
+        print(f"[{timestamp()}] Loaded {len(df)} transcripts from '{INPUT_CSV}'")
+
+        # 1) Fan the same transcript Series out to every enabled scorer
+        with profiler.stage("scorers"):
+            with ThreadPoolExecutor(max_workers=len(ENABLED_SCORERS)) as pool:
+                futures = {
+                    name: pool.submit(run_scorer, name, df["transcript"])
+                    for name in ENABLED_SCORERS
+                }
+                collected = {
+                    name: collect_result(name, futures[name], df.index)
+                    for name in ENABLED_SCORERS
+                }
+        results = [frame for frame, _ in collected.values()]
+        failed  = [name for name, (_, ok) in collected.items() if not ok]
+
+        # 2) Metadata + log columns, then every scorer's columns, keyed by video_id
+        with profiler.stage("log_columns"):
+            merged = add_log_columns(df[METADATA_COLUMNS + ["published_at"]])
+        merged = pd.concat([merged, *results], axis=1)
+
+        ordered = (
+            METADATA_COLUMNS
+            + [f"log_{col}" for col in LOG_COLUMNS]
+            + ["published_at"]
+            + [c for c in merged.columns if c not in METADATA_COLUMNS + ["published_at"]
+               and not c.startswith("log_")]
+        )
+        merged = merged[ordered].set_index("video_id")
+
+        output_csv = PARTIAL_CSV if failed else OUTPUT_CSV
+        with profiler.stage("write_csv"):
+            merged.to_csv(output_csv)
+        print(f"[{timestamp()}] DONE! Wrote {len(merged)} videos to '{output_csv}' "
+              f"with columns: {list(merged.columns)}")
+
+    if failed:
+        print(f"[{timestamp()}] ERROR scorers {failed} failed; '{OUTPUT_CSV}' was left "
+              f"untouched and the other scorers' results are in '{PARTIAL_CSV}'")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()